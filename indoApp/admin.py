@@ -1,9 +1,11 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django import forms
 from django.forms import BaseInlineFormSet
-from django.db.models import Q
-from django.utils.text import slugify
+from django.db.models import Count, Q
+from django.utils.functional import cached_property
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.urls import path
 
 from indoApp.models import *
@@ -95,14 +97,6 @@ class CategoryAdminForm(forms.ModelForm):
         return instance
 
 
-class CategoryAttributeInline(admin.TabularInline):
-    model = CategoryAttribute
-    extra = 1
-    autocomplete_fields = ("attribute",)
-    ordering = ("sort_order",)
-
-
-
 # ======================================================
 # Category Attribute Inline
 # ======================================================
@@ -129,12 +123,31 @@ class ParentCategoryChoiceField(forms.ModelChoiceField):
 # ======================================================
 # Category Admin
 # ======================================================
+# Prebuilt "Level" badges, keyed by Category.depth
+CATEGORY_LEVEL_HTML = {
+    0: mark_safe("<b style='color:green;'>Main</b>"),
+    1: mark_safe("<b style='color:blue;'>Sub</b>"),
+    2: mark_safe("<b style='color:purple;'>Sub Name</b>"),
+}
+
+
+class CategoryChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # ✅ Children count only for the changelist (not change view / autocomplete).
+        # Annotated on root_queryset so "Children" ordering can use it.
+        if "_children_count" not in self.root_queryset.query.annotations:
+            self.root_queryset = self.root_queryset.annotate(_children_count=Count("children"))
+        return super().get_queryset(request, exclude_parameters)
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "category_level", "parent", "is_active", "children_count")
     list_filter = ("is_active",)
     search_fields = ("name", "slug", "parent__name")
-    ordering = ("parent__id", "name")
+    ordering = ("parent_id", "name")
+    list_per_page = 50
+    show_full_result_count = False
     prepopulated_fields = {"slug": ("name",)}
     inlines = [CategoryAttributeInline]
 
@@ -145,30 +158,35 @@ class CategoryAdmin(admin.ModelAdmin):
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "parent":
-            kwargs["queryset"] = (
-                Category.objects.filter(
-                    Q(parent__isnull=True) | Q(parent__parent__isnull=True)
-                )
-                .distinct()
-            .order_by("parent__id", "name")
-        )
-        kwargs["form_class"] = ParentCategoryChoiceField
+            # Main or Sub categories only. Both lookups follow the forward FK,
+            # so rows can't repeat and no DISTINCT is needed.
+            kwargs["queryset"] = Category.objects.filter(
+                Q(parent__isnull=True) | Q(parent__parent__isnull=True)
+            ).order_by("parent_id", "name")
+            kwargs["form_class"] = ParentCategoryChoiceField
 
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+    def get_changelist(self, request, **kwargs):
+        return CategoryChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+
+        # ✅ Product.category autocomplete: only Leaf categories
+        if request.GET.get("model_name") == "product" and request.GET.get("field_name") == "category":
+            queryset = queryset.filter(is_leaf=True)
+
+        return queryset, may_have_duplicates
+
     def children_count(self, obj):
-        return obj.children.count()
+        return obj._children_count
 
     children_count.short_description = "Children"
+    children_count.admin_order_field = "_children_count"
 
     def category_level(self, obj):
-        if obj.parent_id is None:
-            return format_html("<b style='color:green;'>Main</b>")
-
-        if obj.parent and obj.parent.parent_id is None:
-            return format_html("<b style='color:blue;'>Sub</b>")
-
-        return format_html("<b style='color:purple;'>Sub Name</b>")
+        return CATEGORY_LEVEL_HTML[min(obj.depth, 2)]
 
     category_level.short_description = "Level"
 
@@ -182,11 +200,27 @@ class BrandBrochureInlineForm(forms.ModelForm):
         fields = "__all__"
 
 
+class BrandBrochureInlineFormSet(BaseInlineFormSet):
+    @cached_property
+    def _category_choices(self):
+        # Plain iteration: list() would ask ModelChoiceIterator.__len__ for a COUNT(*)
+        return [choice for choice in self.form.base_fields["category"].choices]
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        # ✅ Run the category dropdown query once and share it across all rows
+        form.fields["category"].choices = self._category_choices
+
+
 class BrandBrochureInline(admin.TabularInline):
     model = BrandBrochure
     form = BrandBrochureInlineForm
+    formset = BrandBrochureInlineFormSet
     extra = 1
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("category", "brand")
+
 
 @admin.register(Brand)
 class BrandAdmin(admin.ModelAdmin):
@@ -211,24 +245,10 @@ class AttributeAdmin(admin.ModelAdmin):
 # ======================================================
 # PRODUCT ATTRIBUTE INLINE (Values per product)
 # ======================================================
-class UniqueAttributeInlineFormSet(BaseInlineFormSet):
-    def clean(self):
-        super().clean()
-        seen = set()
-
-        for form in self.forms:
-            if not form.cleaned_data or form.cleaned_data.get("DELETE"):
-                continue
-
-            attr = form.cleaned_data.get("attribute")
-            if attr in seen:
-                raise forms.ValidationError("Duplicate attribute detected for this product.")
-            seen.add(attr)
-
-
+# Duplicate attributes are rejected by the formset's own unique checks
+# (ProductAttributeValue "uq_pav" constraint).
 class ProductAttributeValueInline(admin.TabularInline):
     model = ProductAttributeValue
-    formset = UniqueAttributeInlineFormSet
     extra = 1
     autocomplete_fields = ("attribute",)
     fields = ("attribute", "value_text", "value_number", "value_bool")
@@ -236,31 +256,28 @@ class ProductAttributeValueInline(admin.TabularInline):
 
 
 # ======================================================
-# PRODUCT ADMIN FORM (only leaf categories shown)
+# PRODUCT ADMIN
 # ======================================================
-class ProductAdminForm(forms.ModelForm):
-    class Meta:
-        model = Product
-        fields = "__all__"
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        if "category" in self.fields:
-            self.fields["category"].queryset = Category.objects.filter(children__isnull=True)
+class ProductChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # ✅ Changelist only needs the list_display columns (skip description etc.)
+        return super().get_queryset(request, exclude_parameters).only(
+            "id", "name", "slug", "category", "brand", "price", "stock",
+            "is_active", "is_exclusive", "created_at",
+        )
 
 
-# ======================================================
-# PRODUCT ADMIN
-# ======================================================
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ("name", "category", "brand", "price", "stock", "is_active", "is_exclusive")
+    list_select_related = ("category", "category__parent", "brand")
     list_filter = ("is_active", "brand")
     search_fields = ("name", "slug", "category__name", "brand__name")
     ordering = ("-created_at",)
+    list_per_page = 50
+    show_full_result_count = False
 
-    autocomplete_fields = ("brand",)
+    autocomplete_fields = ("brand", "category")
     prepopulated_fields = {"slug": ("name",)}
     inlines = [ProductAttributeValueInline]
 
@@ -275,16 +292,16 @@ class ProductAdmin(admin.ModelAdmin):
         """
         ✅ Only allow Leaf categories to be selectable for Product.category.
         Leaf = category that has NO children.
+        (Validation only — the autocomplete widget is limited by
+        CategoryAdmin.get_search_results.)
         """
         if db_field.name == "category":
-            kwargs["queryset"] = Category.objects.filter(children__isnull=True).order_by("name")
+            kwargs["queryset"] = Category.objects.filter(is_leaf=True).order_by("name")
 
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
-    def save_model(self, request, obj, form, change):
-        if not obj.slug:
-            obj.slug = slugify(obj.name)
-        super().save_model(request, obj, form, change)
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
 
 
 
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class IndoappConfig(AppConfig):
     name = 'indoApp'
+
+    def ready(self):
+        from indoApp import signals  # noqa: F401
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from indoApp.models import Category
+
+
+CATEGORY_TREE_CACHE_KEY = "category_tree"
+CATEGORY_TREE_TIMEOUT = 300  # seconds; saves/deletes also invalidate it
+LEAF_SLUGS_LIMIT = 12
+
+
+def build_category_tree():
+    """
+    One SELECT over all categories:
+    - child_slugs: SUB id -> active child (leaf) slugs
+    - grandchild_slugs: MAIN id -> active grandchild (leaf) slugs
+    """
+    rows = Category.objects.order_by("id").values_list("id", "parent_id", "slug", "is_active")
+    parents = {pk: parent_id for pk, parent_id, _slug, _active in rows}
+
+    child_slugs = defaultdict(list)
+    grandchild_slugs = defaultdict(list)
+    for pk, parent_id, slug, is_active in rows:
+        if not is_active or parent_id is None:
+            continue
+
+        if len(child_slugs[parent_id]) < LEAF_SLUGS_LIMIT:
+            child_slugs[parent_id].append(slug)
+
+        grandparent_id = parents.get(parent_id)
+        if grandparent_id is not None and len(grandchild_slugs[grandparent_id]) < LEAF_SLUGS_LIMIT:
+            grandchild_slugs[grandparent_id].append(slug)
+
+    return {"child_slugs": dict(child_slugs), "grandchild_slugs": dict(grandchild_slugs)}
+
+
+def get_category_tree():
+    return cache.get_or_set(CATEGORY_TREE_CACHE_KEY, build_category_tree, CATEGORY_TREE_TIMEOUT)
+
+
+def invalidate_category_tree():
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-15 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indoApp', '0009_alter_product_min_order_quantity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['parent', 'name'], name='cat_parent_name_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-15 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indoApp', '0010_category_cat_parent_name_idx'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='productattributevalue',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='productattributevalue',
+            constraint=models.UniqueConstraint(fields=('product', 'attribute'), name='uq_pav'),
+        ),
+    ]
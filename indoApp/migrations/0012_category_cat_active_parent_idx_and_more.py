@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-15 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indoApp', '0011_alter_productattributevalue_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['is_active', 'parent'], name='cat_active_parent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['parent', 'is_active'], name='cat_parent_active_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-15 13:56
+
+from django.db import migrations, models
+
+
+def populate_tree_fields(apps, schema_editor):
+    Category = apps.get_model('indoApp', 'Category')
+
+    parent_ids = Category.objects.filter(parent__isnull=False).values_list('parent_id', flat=True)
+    Category.objects.filter(pk__in=set(parent_ids)).update(is_leaf=False)
+
+    level = list(Category.objects.filter(parent__isnull=True).values_list('pk', flat=True))
+    depth = 0
+    seen = set(level)
+    while level:
+        depth += 1
+        level = [
+            pk
+            for pk in Category.objects.filter(parent_id__in=level).values_list('pk', flat=True)
+            if pk not in seen
+        ]
+        seen.update(level)
+        Category.objects.filter(pk__in=level).update(depth=depth)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indoApp', '0012_category_cat_active_parent_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='is_leaf',
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+        migrations.RunPython(populate_tree_fields, migrations.RunPython.noop),
+    ]
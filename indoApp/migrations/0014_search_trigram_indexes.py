@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+# (model, column) pairs searched with __icontains in SearchAPIView
+TRIGRAM_INDEXES = [
+    ('product', 'name'),
+    ('product', 'slug'),
+    ('category', 'name'),
+    ('category', 'slug'),
+    ('brand', 'name'),
+]
+
+
+def index_name(model_name, column):
+    return f'{model_name}_{column}_trgm_idx'
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # ILIKE '%q%' can only use an index through pg_trgm; other backends skip this.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for model_name, column in TRIGRAM_INDEXES:
+        table = apps.get_model('indoApp', model_name)._meta.db_table
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(index_name(model_name, column))} '
+            f'ON {quote(table)} USING gin ({quote(column)} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    for model_name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {quote(index_name(model_name, column))}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('indoApp', '0013_category_depth_category_is_leaf'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-15 14:01
+
+from django.db import migrations, models
+
+
+def populate_category_path_text(apps, schema_editor):
+    Category = apps.get_model('indoApp', 'Category')
+    Product = apps.get_model('indoApp', 'Product')
+
+    nodes = {pk: (parent_id, name) for pk, parent_id, name in Category.objects.values_list('pk', 'parent_id', 'name')}
+    for pk in nodes:
+        path = []
+        node_id = pk
+        while node_id is not None and node_id in nodes and len(path) < len(nodes):
+            parent_id, name = nodes[node_id]
+            path.append(name)
+            node_id = parent_id
+        Product.objects.filter(category_id=pk).update(category_path_text=' > '.join(reversed(path)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indoApp', '0014_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='category_path_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=512),
+        ),
+        migrations.RunPython(populate_category_path_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+INDEX_NAME = 'product_category_path_text_trgm_idx'
+
+
+def create_trigram_index(apps, schema_editor):
+    # Same as 0014: pg_trgm only exists on PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    table = apps.get_model('indoApp', 'Product')._meta.db_table
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(INDEX_NAME)} '
+        f'ON {quote(table)} USING gin ({quote("category_path_text")} gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('indoApp', '0015_product_category_path_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+INDEX_NAME = 'product_name_lower_prefix_idx'
+
+
+def create_prefix_index(apps, schema_editor):
+    # LOWER(name) LIKE 'q%' needs a pattern_ops btree on PostgreSQL; other backends skip this.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    table = apps.get_model('indoApp', 'Product')._meta.db_table
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(INDEX_NAME)} '
+        f'ON {quote(table)} (LOWER({quote("name")}) text_pattern_ops)'
+    )
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('indoApp', '0016_product_category_path_trigram_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
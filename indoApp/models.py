@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 
 class Category(models.Model):
@@ -16,11 +17,18 @@ class Category(models.Model):
     slug = models.SlugField(max_length=160, unique=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    # Denormalized tree info, maintained by indoApp.signals
+    is_leaf = models.BooleanField(default=True, db_index=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, db_index=True, editable=False)  # 0 Main, 1 Sub, 2 Sub Name
+
     class Meta:
         verbose_name_plural = "Categories"
         indexes = [
             models.Index(fields=["slug"]),
             models.Index(fields=["parent"]),
+            models.Index(fields=["parent", "name"], name="cat_parent_name_idx"),
+            models.Index(fields=["is_active", "parent"], name="cat_active_parent_idx"),
+            models.Index(fields=["parent", "is_active"], name="cat_parent_active_idx"),
         ]
 
     def save(self, *args, **kwargs):
@@ -28,6 +36,15 @@ class Category(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+    def get_full_path(self):
+        # Main > Sub > Sub Name. With select_related("parent__parent") the walk stays in memory.
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.name)
+            node = node.parent
+        return " > ".join(reversed(path))
+
     def __str__(self):
         return self.name
 
@@ -101,8 +118,16 @@ class Product(models.Model):
     stock = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
+    # Denormalized "Main > Sub > Sub Name" for search, maintained by indoApp.signals
+    category_path_text = models.CharField(max_length=512, blank=True, default="", editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -151,11 +176,22 @@ class ProductAttributeValue(models.Model):
     value_bool = models.BooleanField(null=True, blank=True)
 
     class Meta:
-        unique_together = ("product", "attribute")
+        constraints = [
+            models.UniqueConstraint(fields=["product", "attribute"], name="uq_pav"),
+        ]
 
     def __str__(self):
         return f"{self.product.name} - {self.attribute.name}"
 
+    @cached_property
+    def value(self):
+        # ✅ One clean "value" output for frontend
+        if self.value_text:
+            return self.value_text
+        if self.value_number is not None:
+            return self.value_number
+        return self.value_bool
+
 
 
 
@@ -19,19 +19,15 @@ class CategorySerializer(serializers.ModelSerializer):
         ]
 
     def get_category_type(self, obj):
-        if obj.parent is None:
+        if obj.parent_id is None:
             return "MAIN"
-        if obj.children.exists():
+        if not obj.is_leaf:
             return "SUB"
         return "LEAF"  # sub name
 
     def get_full_path(self, obj):
-        path = []
-        node = obj
-        while node:
-            path.append(node.name)
-            node = node.parent
-        return " > ".join(reversed(path))
+        # views select_related("parent__parent"), so this stays in memory
+        return obj.get_full_path()
 
 
 
@@ -87,7 +83,7 @@ class CategoryAttributeSerializer(serializers.ModelSerializer):
 class ProductAttributeValueSerializer(serializers.ModelSerializer):
     attribute = AttributeSerializer(read_only=True)
 
-    value = serializers.SerializerMethodField()
+    value = serializers.ReadOnlyField()
 
     class Meta:
         model = ProductAttributeValue
@@ -100,16 +96,6 @@ class ProductAttributeValueSerializer(serializers.ModelSerializer):
             "value_bool",
         ]
 
-    def get_value(self, obj):
-        # ✅ One clean "value" output for frontend
-        if obj.value_text not in [None, ""]:
-            return obj.value_text
-        if obj.value_number is not None:
-            return obj.value_number
-        if obj.value_bool is not None:
-            return obj.value_bool
-        return None
-
 
 
 
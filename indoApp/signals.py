@@ -0,0 +1,146 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from indoApp.category_tree import invalidate_category_tree
+from indoApp.models import Category, Product
+
+
+# ======================================================
+# Category.is_leaf / Category.depth maintenance
+# ======================================================
+def refresh_is_leaf(category_id):
+    has_children = Category.objects.filter(parent_id=category_id).exists()
+    Category.objects.filter(pk=category_id).update(is_leaf=not has_children)
+
+
+def update_descendant_depths(category):
+    level = [category.pk]
+    depth = category.depth
+    seen = set(level)
+
+    while level:
+        depth += 1
+        level = [
+            pk
+            for pk in Category.objects.filter(parent_id__in=level).values_list("pk", flat=True)
+            if pk not in seen
+        ]
+        seen.update(level)
+        Category.objects.filter(pk__in=level).update(depth=depth)
+
+
+@receiver(pre_save, sender=Category)
+def set_category_tree_fields(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    instance._old_parent_id = None
+    instance._old_depth = None
+    instance._old_name = None
+
+    if instance.pk:
+        old = Category.objects.filter(pk=instance.pk).values("parent_id", "depth", "name").first()
+        if old:
+            instance._old_parent_id = old["parent_id"]
+            instance._old_depth = old["depth"]
+            instance._old_name = old["name"]
+        # ✅ don't let a stale in-memory flag overwrite the real one
+        instance.is_leaf = not Category.objects.filter(parent_id=instance.pk).exists()
+
+    # ✅ same for the parent's depth: a cached parent may predate a move of its ancestors
+    if instance.parent_id:
+        parent_depth = Category.objects.filter(pk=instance.parent_id).values_list("depth", flat=True).first()
+        instance.depth = (parent_depth or 0) + 1
+    else:
+        instance.depth = 0
+
+
+@receiver(post_save, sender=Category)
+def update_category_tree_neighbours(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if instance.parent_id:
+        Category.objects.filter(pk=instance.parent_id, is_leaf=True).update(is_leaf=False)
+        if Category.parent.is_cached(instance):
+            instance.parent.is_leaf = False
+
+    old_parent_id = getattr(instance, "_old_parent_id", None)
+    if old_parent_id and old_parent_id != instance.parent_id:
+        refresh_is_leaf(old_parent_id)
+
+    old_depth = getattr(instance, "_old_depth", None)
+    if old_depth is not None and old_depth != instance.depth:
+        update_descendant_depths(instance)
+
+
+@receiver(post_delete, sender=Category)
+def refresh_parent_is_leaf(sender, instance, **kwargs):
+    if instance.parent_id:
+        refresh_is_leaf(instance.parent_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def clear_category_tree_cache(sender, **kwargs):
+    invalidate_category_tree()
+
+
+# ======================================================
+# Product.category_path_text maintenance
+# ======================================================
+def category_full_path(category_id):
+    # Read the ancestors fresh; a cached parent chain may predate a rename or move
+    return Category.objects.select_related("parent__parent").get(pk=category_id).get_full_path()
+
+
+def refresh_product_category_paths(category):
+    # Walk the subtree top-down so each path is built from its parent's
+    paths = {category.pk: category_full_path(category.pk)}
+    level = [category.pk]
+
+    while level:
+        for pk in level:
+            Product.objects.filter(category_id=pk).update(category_path_text=paths[pk])
+
+        children = (
+            Category.objects.filter(parent_id__in=level)
+            .exclude(pk__in=paths)
+            .values_list("pk", "parent_id", "name")
+        )
+        level = []
+        for pk, parent_id, name in children:
+            paths[pk] = f"{paths[parent_id]} > {name}"
+            level.append(pk)
+
+
+@receiver(post_save, sender=Category)
+def update_category_product_paths(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+
+    old_name = getattr(instance, "_old_name", None)
+    old_parent_id = getattr(instance, "_old_parent_id", None)
+    if old_name is None or (old_name == instance.name and old_parent_id == instance.parent_id):
+        return
+
+    refresh_product_category_paths(instance)
+
+
+@receiver(pre_save, sender=Product)
+def set_product_category_path(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    # ✅ save(update_fields=[...]) that doesn't write the path: nothing to do
+    if update_fields is not None and "category_path_text" not in update_fields:
+        return
+
+    if instance.pk and update_fields is None:
+        old = Product.objects.filter(pk=instance.pk).values("category_id", "category_path_text").first()
+        if old and old["category_id"] == instance.category_id:
+            # Same category: keep the stored path (renames/moves rewrite it in bulk)
+            instance.category_path_text = old["category_path_text"]
+            return
+
+    instance.category_path_text = category_full_path(instance.category_id) if instance.category_id else ""
@@ -1,3 +1,272 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
 from django.test import TestCase
+from django.utils import timezone
+
+from indoApp.category_tree import get_category_tree
+from indoApp.models import Brand, Category, Product
+
+
+class CategoryTreeFieldsTests(TestCase):
+    def refresh(self, *categories):
+        for category in categories:
+            category.refresh_from_db()
+
+    def test_create_sets_depth_and_marks_parent_as_branch(self):
+        main = Category.objects.create(name="Tools")
+        self.assertEqual(main.depth, 0)
+        self.assertTrue(main.is_leaf)
+
+        sub = Category.objects.create(name="Power Tools", parent=main)
+        leaf = Category.objects.create(name="Drills", parent=sub)
+        self.refresh(main, sub, leaf)
+
+        self.assertEqual((main.depth, sub.depth, leaf.depth), (0, 1, 2))
+        self.assertFalse(main.is_leaf)
+        self.assertFalse(sub.is_leaf)
+        self.assertTrue(leaf.is_leaf)
+
+    def test_reparent_updates_depths_and_both_parents(self):
+        tools = Category.objects.create(name="Tools")
+        lighting = Category.objects.create(name="Lighting")
+        lamps = Category.objects.create(name="Lamps", parent=lighting)
+        sub = Category.objects.create(name="Power Tools", parent=tools)
+        leaf = Category.objects.create(name="Drills", parent=sub)
+
+        # Main -> Sub: the moved node and its child both go one level deeper
+        sub.parent = lamps
+        sub.save()
+        self.refresh(tools, lamps, sub, leaf)
+
+        self.assertEqual(sub.depth, 2)
+        self.assertEqual(leaf.depth, 3)
+        self.assertTrue(tools.is_leaf)
+        self.assertFalse(lamps.is_leaf)
+
+        # Back to the top level
+        sub.parent = None
+        sub.save()
+        self.refresh(lamps, sub, leaf)
+
+        self.assertEqual(sub.depth, 0)
+        self.assertEqual(leaf.depth, 1)
+        self.assertTrue(lamps.is_leaf)
+        self.assertFalse(sub.is_leaf)
+
+    def test_stale_is_leaf_is_not_saved_back(self):
+        main = Category.objects.create(name="Tools")
+        stale = Category.objects.get(pk=main.pk)
+        Category.objects.create(name="Power Tools", parent=main)
+
+        stale.name = "Hand & Power Tools"
+        stale.save()
+        stale.refresh_from_db()
+
+        self.assertFalse(stale.is_leaf)
+
+    def test_stale_parent_depth_is_not_saved_back(self):
+        main = Category.objects.create(name="Tools")
+        sub = Category.objects.create(name="Power Tools", parent=main)
+        leaf = Category.objects.create(name="Drills", parent=sub)
+        top = Category.objects.create(name="Hardware")
+
+        main.parent = top
+        main.save()
+
+        # leaf.parent is still the in-memory sub from before the move (depth 1)
+        leaf.name = "Hammer Drills"
+        leaf.save()
+        leaf.refresh_from_db()
+
+        self.assertEqual(leaf.depth, 3)
+
+    def test_delete_last_child_makes_parent_a_leaf(self):
+        main = Category.objects.create(name="Tools")
+        first = Category.objects.create(name="Power Tools", parent=main)
+        second = Category.objects.create(name="Hand Tools", parent=main)
+
+        first.delete()
+        main.refresh_from_db()
+        self.assertFalse(main.is_leaf)
+
+        second.delete()
+        main.refresh_from_db()
+        self.assertTrue(main.is_leaf)
+
+
+class ProductCategoryPathTests(TestCase):
+    def setUp(self):
+        self.main = Category.objects.create(name="Tools")
+        self.sub = Category.objects.create(name="Power Tools", parent=self.main)
+        self.leaf = Category.objects.create(name="Drills", parent=self.sub)
+        self.product = Product.objects.create(name="Impact Drill", category=self.leaf)
+
+    def path(self, product):
+        return Product.objects.values_list("category_path_text", flat=True).get(pk=product.pk)
+
+    def test_product_save_sets_path(self):
+        self.assertEqual(self.path(self.product), "Tools > Power Tools > Drills")
+
+        other = Category.objects.create(name="Grinders", parent=self.sub)
+        self.product.category = other
+        self.product.save()
+
+        self.assertEqual(self.path(self.product), "Tools > Power Tools > Grinders")
+
+    def test_ancestor_rename_rewrites_subtree(self):
+        on_sub = Product.objects.create(name="Drill Kit", category=self.sub)
+
+        self.main.name = "Hardware"
+        self.main.save()
+
+        self.assertEqual(self.path(self.product), "Hardware > Power Tools > Drills")
+        self.assertEqual(self.path(on_sub), "Hardware > Power Tools")
+
+    def test_ancestor_move_rewrites_subtree(self):
+        lighting = Category.objects.create(name="Lighting")
+
+        self.sub.parent = lighting
+        self.sub.save()
+
+        self.assertEqual(self.path(self.product), "Lighting > Power Tools > Drills")
+
+    def test_stale_category_chain_still_writes_full_path(self):
+        top = Category.objects.create(name="Hardware")
+        self.main.parent = top
+        self.main.save()
+
+        # self.leaf still caches sub (depth 1) from before the move
+        self.leaf.name = "Hammer Drills"
+        self.leaf.save()
+
+        self.assertEqual(self.path(self.product), "Hardware > Tools > Power Tools > Hammer Drills")
+
+    def test_full_path_walks_to_root(self):
+        # unsaved, so depth is still the default 0
+        bits = Category(name="Bits", parent=self.leaf)
+
+        self.assertEqual(bits.get_full_path(), "Tools > Power Tools > Drills > Bits")
+
+    def test_partial_save_skips_path(self):
+        product = Product.objects.get(pk=self.product.pk)
+        product.stock = 5
+
+        with self.assertNumQueries(1):
+            product.save(update_fields=["stock"])
+
+    def test_full_save_keeps_stored_path(self):
+        product = Product.objects.get(pk=self.product.pk)
+        self.sub.name = "Cordless Tools"
+        self.sub.save()
+
+        # product was loaded before the rename; its in-memory path is stale
+        product.stock = 5
+        product.save()
+
+        self.assertEqual(self.path(product), "Tools > Cordless Tools > Drills")
+
+    def test_unchanged_category_save_leaves_products_alone(self):
+        Product.objects.filter(pk=self.product.pk).update(category_path_text="untouched")
+
+        self.sub.is_active = False
+        self.sub.save()
+
+        self.assertEqual(self.path(self.product), "untouched")
+
+
+class ProductListPaginationTests(TestCase):
+    def test_ordering_by_price_keeps_products_without_price(self):
+        category = Category.objects.create(name="Tools")
+        for i in range(30):
+            Product.objects.create(name=f"Drill {i}", category=category, price=None if i % 3 == 0 else i)
+
+        seen = []
+        url = "/api/products/?ordering=-price"
+        while url:
+            data = self.client.get(url).json()
+            seen += [p["id"] for p in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(len(seen), 30)
+        self.assertEqual(len(set(seen)), 30)
+
+
+class SearchAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.main = Category.objects.create(name="Tools")
+        self.sub = Category.objects.create(name="Power Tools", parent=self.main)
+        drills = Category.objects.create(name="Drills", parent=self.sub)
+        sanders = Category.objects.create(name="Sanders", parent=self.sub)
+        brand = Brand.objects.create(name="Drillmaster")
+
+        # oldest first; each matches "drill" through a different field
+        products = [
+            Product(name="Drill Kit", category=sanders),  # name prefix
+            Product(name="Cordless Drill", category=sanders),  # name
+            Product(name="Bit Set", category=drills),  # category path
+            Product(name="Widget", category=sanders, brand=brand),  # brand
+            Product(name="Hammer", slug="hammer-drill-x", category=sanders),  # slug
+            Product(name="Saw", category=sanders),  # no match
+            Product(name="Drill Press", category=sanders, is_active=False),  # inactive
+        ]
+        now = timezone.now()
+        for i, product in enumerate(products):
+            product.save()
+            Product.objects.filter(pk=product.pk).update(created_at=now + timedelta(minutes=i))
+
+    def search(self, q, **params):
+        return self.client.get("/search/", {"q": q, **params}).json()
+
+    def product_ids(self, q, **params):
+        return [p["id"] for p in self.search(q, **params)["products"]]
+
+    def or_filter_ids(self, q, limit):
+        return list(
+            Product.objects.filter(is_active=True)
+            .filter(
+                Q(name__icontains=q)
+                | Q(slug__icontains=q)
+                | Q(category_path_text__icontains=q)
+                | Q(brand__name__icontains=q)
+            )
+            .order_by("-created_at")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    def test_merged_lookups_match_single_or_filter(self):
+        # "rill" starts no product name, so every limit takes the merged lookups
+        for limit in range(1, 8):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.product_ids("rill", products_limit=limit), self.or_filter_ids("rill", limit))
+
+    def test_prefix_hits_fill_the_limit(self):
+        drill_kit = Product.objects.get(name="Drill Kit")
+
+        # the oldest match, but the only active name starting with "drill"
+        self.assertEqual(self.product_ids("drill", products_limit=1), [drill_kit.pk])
+
+    def test_too_few_prefix_hits_fall_through(self):
+        self.assertEqual(self.product_ids("drill", products_limit=3), self.or_filter_ids("drill", 3))
+
+    def test_leaf_slugs_for_main_and_sub(self):
+        categories = self.search("tools")["categories"]
+
+        self.assertEqual(
+            [(c["slug"], c["leaf_slugs"]) for c in categories["main"]], [("tools", ["drills", "sanders"])]
+        )
+        self.assertEqual(
+            [(c["slug"], c["leaf_slugs"]) for c in categories["sub"]], [("power-tools", ["drills", "sanders"])]
+        )
+
+    def test_category_save_invalidates_tree(self):
+        self.assertEqual(get_category_tree()["child_slugs"][self.sub.pk], ["drills", "sanders"])
+
+        Category.objects.create(name="Grinders", parent=self.sub)
 
-# Create your tests here.
+        self.assertEqual(get_category_tree()["child_slugs"][self.sub.pk], ["drills", "sanders", "grinders"])
+        sub = self.search("power")["categories"]["sub"][0]
+        self.assertEqual(sub["leaf_slugs"], ["drills", "sanders", "grinders"])
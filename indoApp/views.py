@@ -1,6 +1,12 @@
+import hashlib
+
 from rest_framework import viewsets, filters, permissions
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Prefetch
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Prefetch, Value
+from django.db.models.functions import Coalesce, Lower
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -12,13 +18,14 @@ from rest_framework import generics
 from indoApp.models import *
 
 from indoApp.serializers import *
+from indoApp.category_tree import get_category_tree
 
 
 # ============================
 # CATEGORY VIEWSET
 # ============================
 class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = Category.objects.all().select_related("parent")
+    queryset = Category.objects.all().select_related("parent__parent")
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
 
@@ -33,7 +40,9 @@ class CategoryViewSet(viewsets.ModelViewSet):
 # BRAND VIEWSET
 # ============================
 class BrandViewSet(viewsets.ModelViewSet):
-    queryset = Brand.objects.all()
+    queryset = Brand.objects.prefetch_related(
+        Prefetch("brochures", queryset=BrandBrochure.objects.select_related("category"))
+    ).all()
     serializer_class = BrandSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -115,27 +124,27 @@ class ProductViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         ✅ Optimized queryset (important for production)
-        - select_related: category, brand
-        - prefetch_related: attributes + attribute details
+        - select_related: category (with its ancestors for full_path), brand
+        - prefetch_related: attributes + attribute details, brand brochures
         """
         return (
-            Product.objects.select_related("category", "brand")
+            Product.objects.select_related("category__parent__parent", "brand")
             .prefetch_related(
                 Prefetch(
                     "attributes",
                     queryset=ProductAttributeValue.objects.select_related("attribute").all(),
-                )
+                ),
+                Prefetch(
+                    "brand__brochures",
+                    queryset=BrandBrochure.objects.select_related("category").all(),
+                ),
             )
             .all()
         )
 
 
+SEARCH_CACHE_TIMEOUT = 60  # seconds
 
-from django.db.models import Q
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from rest_framework import status
 
 class SearchAPIView(APIView):
     permission_classes = [AllowAny]
@@ -158,136 +167,167 @@ class SearchAPIView(APIView):
         categories_limit = int(request.GET.get("categories_limit", 6))
         brands_limit = int(request.GET.get("brands_limit", 6))
 
+        # scheme + host, computed once for every image URL in the response
+        base_url = request.build_absolute_uri("/")[:-1]
+
+        # ✅ Cache per normalized query + limits (+ host, since image URLs are absolute)
+        cache_key = "search:" + hashlib.md5(
+            f"{base_url}|{q.lower()}|{products_limit}|{categories_limit}|{brands_limit}".encode()
+        ).hexdigest()
+        results = cache.get_or_set(
+            cache_key,
+            lambda: self.get_results(base_url, q, products_limit, categories_limit, brands_limit),
+            SEARCH_CACHE_TIMEOUT,
+        )
+
+        return Response({"query": q, **results}, status=status.HTTP_200_OK)
+
+    def get_results(self, base_url, q, products_limit, categories_limit, brands_limit):
+        def absolute_url(url):
+            if url.startswith(("http://", "https://", "//")):
+                return url
+            return f"{base_url}{url}"
+
+        # ✅ Each stored file is resolved once per search (brand logos repeat across products)
+        file_urls = {}
+
+        def file_url(storage, name):
+            if not name:
+                return None
+            if (storage, name) not in file_urls:
+                file_urls[storage, name] = absolute_url(storage.url(name))
+            return file_urls[storage, name]
+
+        image_storage = Product._meta.get_field("image").storage
+        logo_storage = Brand._meta.get_field("logo").storage
+
         # ✅ PRODUCTS
-        product_qs = (
-            Product.objects.select_related("category", "brand")
-            .filter(is_active=True)
-            .filter(
-                Q(name__icontains=q)
-                | Q(slug__icontains=q)
-                | Q(category__name__icontains=q)
-                | Q(category__parent__name__icontains=q)
-                | Q(brand__name__icontains=q)
-            )
-            .order_by("-created_at")[:products_limit]
+        product_qs = Product.objects.filter(is_active=True)
+
+        # ✅ Rank by pg_trgm similarity on PostgreSQL (newest first elsewhere)
+        if connection.vendor == "postgresql":
+            product_qs = product_qs.annotate(
+                rank=TrigramSimilarity("name", q)
+                + 0.5 * Coalesce(TrigramSimilarity("brand__name", q), Value(0.0))
+            ).order_by(F("rank").desc(), "-created_at")
+            product_fields = ("rank", "created_at")
+        else:
+            product_qs = product_qs.order_by("-created_at")
+            product_fields = ("created_at",)
+
+        product_values = (
+            "id", "name", "slug", "image", "price", "old_price",
+            "category_id", "category__name", "category__slug",
+            "brand_id", "brand__name", "brand__logo",
+            *product_fields,
         )
 
-        products = []
-        for p in product_qs:
-            products.append(
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "slug": p.slug,
-                    "image": request.build_absolute_uri(p.image.url)
-                    if getattr(p, "image", None)
-                    else None,
-                    "price": str(p.price),
-                    "old_price": str(p.old_price) if p.old_price else None,
-                    "brand": {
-                        "id": p.brand.id,
-                        "name": p.brand.name,
-                        "logo": request.build_absolute_uri(p.brand.logo.url)
-                        if getattr(p.brand, "logo", None)
-                        else None,
-                    }
-                    if p.brand
-                    else None,
-                    "leaf_category": {
-                        "id": p.category.id,
-                        "name": p.category.name,
-                        "slug": p.category.slug,
-                        "full_path": None,
-                    }
-                    if p.category
-                    else None,
-                }
+        def product_sort_key(p):
+            return tuple(p[f] for f in product_fields)
+
+        # ✅ Plain word queries try a name prefix match first: LOWER(name) LIKE 'q%'
+        # is a btree range scan (migration 0017) rather than a trigram lookup
+        product_rows = []
+        if len(q) >= 3 and q.isalnum():
+            product_rows = list(
+                product_qs.alias(name_lower=Lower("name"))
+                .filter(name_lower__startswith=q.lower())
+                .values(*product_values)[:products_limit]
             )
 
+        # ✅ One single-column lookup per searched field (each can use its own
+        # trigram index instead of an OR across joins); merging the top rows of
+        # every lookup gives the same top products_limit as the combined filter
+        if len(product_rows) < products_limit:
+            matches = {}
+            for lookup in ("name", "slug", "category_path_text", "brand__name"):
+                rows = product_qs.filter(**{f"{lookup}__icontains": q}).values(*product_values)[:products_limit]
+                for p in rows:
+                    matches[p["id"]] = p
+
+            product_rows = sorted(matches.values(), key=product_sort_key, reverse=True)[:products_limit]
+
+        products = [
+            {
+                "id": p["id"],
+                "name": p["name"],
+                "slug": p["slug"],
+                "image": file_url(image_storage, p["image"]),
+                "price": str(p["price"]),
+                "old_price": str(p["old_price"]) if p["old_price"] else None,
+                "brand": {
+                    "id": p["brand_id"],
+                    "name": p["brand__name"],
+                    "logo": file_url(logo_storage, p["brand__logo"]),
+                }
+                if p["brand_id"]
+                else None,
+                "leaf_category": {
+                    "id": p["category_id"],
+                    "name": p["category__name"],
+                    "slug": p["category__slug"],
+                    "full_path": None,
+                },
+            }
+            for p in product_rows
+        ]
+
         # ✅ BRANDS
-        brand_qs = (
+        brand_rows = (
             Brand.objects.filter(is_active=True)
             .filter(Q(name__icontains=q))
-            .order_by("name")[:brands_limit]
+            .order_by("name")
+            .values("id", "name", "logo")[:brands_limit]
         )
 
-        brands = []
-        for b in brand_qs:
-            brands.append(
-                {
-                    "id": b.id,
-                    "name": b.name,
-                    "logo": request.build_absolute_uri(b.logo.url)
-                    if getattr(b, "logo", None)
-                    else None,
-                }
-            )
+        brands = [
+            {
+                "id": b["id"],
+                "name": b["name"],
+                "logo": file_url(logo_storage, b["logo"]),
+            }
+            for b in brand_rows
+        ]
 
         # ✅ CATEGORIES (NO category_type field)
+        # Single-table match; a matched MAIN/SUB already carries its leaves via leaf_slugs
         category_qs = (
             Category.objects.filter(is_active=True)
-            .filter(
-                Q(name__icontains=q)
-                | Q(slug__icontains=q)
-                | Q(parent__name__icontains=q)
-                | Q(parent__parent__name__icontains=q)
-            )
-            .select_related("parent", "parent__parent")
-            .order_by("parent_id", "name")[: categories_limit * 3]
+            .filter(Q(name__icontains=q) | Q(slug__icontains=q))
+            .order_by("parent_id", "name")
+            .values("id", "name", "slug", "depth")[: categories_limit * 3]
         )
 
         main_categories = []
         sub_categories = []
         leaf_categories = []
 
-        def get_category_type(cat: Category):
-            if cat.parent is None:
+        def get_category_type(depth):
+            if depth == 0:
                 return "MAIN"
-            if cat.parent and cat.parent.parent is None:
+            if depth == 1:
                 return "SUB"
             return "LEAF"
 
-        def get_leaf_slugs_for(cat: Category):
-            ctype = get_category_type(cat)
-
-            if ctype == "MAIN":
-                # MAIN -> SUB -> LEAF
-                return list(
-                    Category.objects.filter(
-                        is_active=True,
-                        parent__parent=cat,
-                    )
-                    .values_list("slug", flat=True)
-                    .distinct()[:12]
-                )
-
-            if ctype == "SUB":
-                # SUB -> LEAF
-                return list(
-                    Category.objects.filter(
-                        is_active=True,
-                        parent=cat,
-                    )
-                    .values_list("slug", flat=True)
-                    .distinct()[:12]
-                )
-
-            # LEAF
-            return [cat.slug]
+        # ✅ Leaf slugs come from the cached category tree (no per-request query)
+        # MAIN -> SUB -> LEAF (grandchildren), SUB -> LEAF (children)
+        tree = get_category_tree()
 
         for c in category_qs:
-            ctype = get_category_type(c)
+            ctype = get_category_type(c["depth"])
 
             item = {
-                "id": c.id,
-                "name": c.name,
-                "slug": c.slug,
+                "id": c["id"],
+                "name": c["name"],
+                "slug": c["slug"],
                 "category_type": ctype,
                 "full_path": None,
             }
 
-            if ctype in ["MAIN", "SUB"]:
-                item["leaf_slugs"] = get_leaf_slugs_for(c)
+            if ctype == "MAIN":
+                item["leaf_slugs"] = tree["grandchild_slugs"].get(c["id"], [])
+            elif ctype == "SUB":
+                item["leaf_slugs"] = tree["child_slugs"].get(c["id"], [])
 
             if ctype == "MAIN":
                 main_categories.append(item)
@@ -301,19 +341,15 @@ class SearchAPIView(APIView):
         sub_categories = sub_categories[:categories_limit]
         leaf_categories = leaf_categories[:categories_limit]
 
-        return Response(
-            {
-                "query": q,
-                "products": products,
-                "brands": brands,
-                "categories": {
-                    "main": main_categories,
-                    "sub": sub_categories,
-                    "leaf": leaf_categories,
-                },
+        return {
+            "products": products,
+            "brands": brands,
+            "categories": {
+                "main": main_categories,
+                "sub": sub_categories,
+                "leaf": leaf_categories,
             },
-            status=status.HTTP_200_OK,
-        )
+        }
 
 
 class HomeBannerViewSet(viewsets.ModelViewSet):